@@ -3,12 +3,16 @@
 # =============================================================================
 import azure.functions as func  # Azure Functions SDK - required for all Azure Functions
 import logging                  # Built-in Python library for printing log messages
-import json                     # Built-in Python library for working with JSON data
+import orjson                   # Fast JSON library (written in Rust) - much quicker than the built-in json
+import json                     # Built-in JSON library (only used to measure entities the way the Azure SDK sends them)
 import re                       # Built-in Python library for Regular Expressions (pattern matching)
 import os                       # Built-in Python library for environment variables
-import uuid                     # Built-in Python library for generating unique IDs
-from datetime import datetime   # Built-in Python library for working with dates and times
-from azure.data.tables import TableClient # Azure Table Storage SDK
+import secrets                  # Built-in Python library for generating random (unique) IDs
+import asyncio                  # Built-in Python library for async code (doing other work while waiting on the network)
+import time                     # Built-in Python library for working with the current time
+import hashlib                  # Built-in Python library for hashing (we use SHA-256)
+from collections import OrderedDict # Built-in dictionary that remembers order (used for our cache)
+from azure.data.tables.aio import TableClient # Azure Table Storage SDK (async version)
 
 # =============================================================================
 # CREATE THE FUNCTION APP
@@ -20,35 +24,472 @@ app = func.FunctionApp(http_auth_level=func.AuthLevel.ANONYMOUS)
 # =============================================================================
 # DATABASE CONFIGURATION
 # =============================================================================
-# We'll connect to the database lazily (only when needed)
+# We'll connect to the database lazily (only when needed), and only once.
+# Our functions are async, so several requests can be in progress at the same
+# time while they wait on the network - a Lock makes sure only one of them
+# sets up the client.
 table_client = None
-
-def get_table_client():
-    global table_client
-    if not table_client:
+_table_client_ready = False
+_table_client_lock = asyncio.Lock()
+
+async def get_table_client():
+    global table_client, _table_client_ready
+    # Fast path: after the first call, just return the cached client (or None)
+    if _table_client_ready:
+        return table_client
+    async with _table_client_lock:
+        # Check again - another request may have finished while we waited
+        if _table_client_ready:
+            return table_client
         connection_string = os.environ.get("TABLE_STORAGE_CONNECTION_STRING")
         if connection_string:
             try:
-                table_client = TableClient.from_connection_string(
+                client = TableClient.from_connection_string(
                     conn_str=connection_string,
                     table_name="Analyses"
                 )
                 # Create the table if it doesn't exist
                 try:
-                    table_client.create_table()
+                    await client.create_table()
                 except Exception:
                     pass # Table likely already exists
+                table_client = client
             except Exception as e:
                 logging.error(f"Error connecting to Table Storage: {e}")
+        # Whatever happened, don't repeat the setup on every request
+        _table_client_ready = True
     return table_client
 
+# =============================================================================
+# BACKGROUND SAVES
+# =============================================================================
+# The response doesn't depend on the database write, so we start the write
+# in the background and answer the user right away instead of waiting for
+# the Table Storage round-trip.
+# asyncio only keeps weak references to tasks, so we hold on to them here
+# until they finish (otherwise they could be garbage collected mid-save).
+_background_tasks = set()
+
+async def _save_and_log(save, what):
+    """Waits for a Table Storage save and logs it if it fails."""
+    try:
+        await save
+    except Exception as e:
+        logging.error(f"Failed to save {what} to Table Storage: {e}")
+
+def save_in_background(save, what):
+    """
+    Runs a Table Storage save without waiting for it.
+
+    Parameters:
+        save: The coroutine doing the save (e.g. tc.create_entity(...))
+        what: A short description used in the error log
+    """
+    task = asyncio.create_task(_save_and_log(save, what))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+# =============================================================================
+# JSON HELPERS
+# =============================================================================
+# Compact JSON is smaller and faster to produce, so that's the default.
+# Add ?pretty=1 to the URL to get nicely indented JSON (handy for debugging)
+def json_options(req):
+    """Returns the orjson options to use for this request's response."""
+    if req.params.get('pretty') == '1':
+        return orjson.OPT_INDENT_2
+    return 0
+
+def json_response(data, status_code=200, option=0):
+    """
+    Builds a JSON HTTP response.
+
+    orjson.dumps() already returns UTF-8 bytes, and passing bytes as the
+    body means the Functions worker doesn't have to encode a string again.
+    """
+    return json_bytes_response(orjson.dumps(data, option=option), status_code)
+
+def json_bytes_response(body, status_code):
+    """Builds a JSON HTTP response from a body that is already JSON bytes."""
+    return func.HttpResponse(
+        body=body,
+        mimetype="application/json",
+        status_code=status_code
+    )
+
+# =============================================================================
+# PRECOMPILED PATTERNS
+# =============================================================================
+# Compiling a regular expression once when the app starts is cheaper than
+# looking it up again on every request
+# r'[.!?]+' means: any sequence of periods, exclamation marks, or question marks
+_SENTENCE_RE = re.compile(r'[.!?]+')
+
+# A paragraph break is a blank line (\n\n), plus any further blank lines that
+# only have whitespace between them - "a\n\n\n\nb" is still 2 paragraphs.
+# \s in re understands Unicode whitespace, just like str.strip() does.
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\n(?:\s*?\n\n)*')
+
+# =============================================================================
+# TEXT ANALYSIS HELPER
+# =============================================================================
+# All the statistics are computed here, in one place, so the text is only
+# walked as few times as possible. Every step below uses built-in string
+# methods (split, count, len, ...) which run in C, so they are much faster
+# than looping over the text one character at a time in Python.
+def analyze_text(text):
+    """
+    Computes all the statistics for a piece of text.
+
+    Parameters:
+        text: The text to analyze (a non-empty string)
+
+    Returns:
+        dict: The analysis results (the same dictionary is stored in the
+              database and sent back to the user)
+    """
+    # ----- Word Analysis -----
+    # split() breaks the text into a list of words
+    # "Hello world" becomes ["Hello", "world"]
+    words = text.split()
+
+    # len() counts items in a list
+    # ["Hello", "world"] has length 2
+    word_count = len(words)
+
+    # ----- Character Analysis -----
+    # len() on a string counts characters (including spaces)
+    # "Hello world" has 11 characters
+    char_count = len(text)
+
+    # count(" ") counts the spaces, so we subtract them from the total
+    # (this avoids building a whole new copy of the text without spaces)
+    # "Hello world" has 11 characters - 1 space = 10 characters
+    char_count_no_spaces = char_count - text.count(" ")
+
+    # ----- Sentence Analysis -----
+    # findall() finds all matches of the (precompiled) pattern
+    # "Hello! How are you?" returns ['!', '?'] (2 sentences)
+    # The "or 1" means: if no punctuation found, assume at least 1 sentence
+    sentence_count = len(_SENTENCE_RE.findall(text)) or 1
+
+    # ----- Paragraph Analysis -----
+    # Paragraphs are separated by blank lines (two newlines: \n\n)
+    # Instead of splitting the text into a list of paragraphs, we just count
+    # the breaks between them: 1 break means 2 paragraphs, and so on
+    # strip() removes whitespace at the start and end, so blank lines there
+    # don't count as breaks (and a text of only spaces has 0 paragraphs)
+    stripped = text.strip()
+    paragraph_count = sum(1 for _ in _PARAGRAPH_BREAK_RE.finditer(stripped)) + 1 if stripped else 0
+
+    # ----- Reading Time Calculation -----
+    # Average reading speed is about 200 words per minute
+    # round(x, 1) rounds to 1 decimal place
+    # 100 words / 200 wpm = 0.5 minutes
+    reading_time_minutes = round(word_count / 200, 1)
+
+    # ----- Average Word Length -----
+    # Total characters (no spaces) divided by number of words
+    # We check "if word_count > 0" to avoid dividing by zero
+    avg_word_length = round(char_count_no_spaces / word_count, 1) if word_count > 0 else 0
+
+    # ----- Find Longest Word -----
+    # max() finds the largest item
+    # key=len means "compare words by their length"
+    # max(["Hi", "Hello", "Hey"], key=len) returns "Hello"
+    # default="" is returned when there are no words at all
+    # (max() loops over the list in C, which is faster than a Python for-loop)
+    longest_word = max(words, key=len, default="")
+
+    return {
+        "wordCount": word_count,
+        "characterCount": char_count,
+        "characterCountNoSpaces": char_count_no_spaces,
+        "sentenceCount": sentence_count,
+        "paragraphCount": paragraph_count,
+        "averageWordLength": avg_word_length,
+        "longestWord": longest_word,
+        "readingTimeMinutes": reading_time_minutes
+    }
+
+# =============================================================================
+# ROW KEYS (NEWEST FIRST)
+# =============================================================================
+# Table Storage always returns rows sorted by RowKey (as text, A to Z).
+# If we put "time remaining until the year 9999" at the start of the RowKey,
+# newer rows get *smaller* keys and come back first - so the database does the
+# sorting for us and we can stop reading after 'limit' rows.
+# This uses .NET "ticks" (100-nanosecond steps since 0001-01-01), the usual
+# convention for this Azure Tables pattern.
+#
+# Older rows used a random UUID as RowKey, and those would mix in between
+# the new keys (a UUID starting with "0" or "1" sorts before "2516..."). So
+# the newest-first rows live in their own partition, where only keys made
+# by make_row_key exist. Old rows stay in the "Analysis" partition.
+PARTITION_KEY = "AnalysisV2"
+_UNIX_EPOCH_TICKS = 621355968000000000  # Ticks at 1970-01-01 (where time.time_ns() starts)
+_MAX_TICKS = 3155378975999999999        # .NET DateTime.MaxValue.Ticks
+
+def make_row_key(now_ns, unique_id):
+    """
+    Builds a RowKey that sorts newest-first.
+
+    Parameters:
+        now_ns: The time of the analysis, from time.time_ns()
+        unique_id: A unique string so two rows never collide
+
+    Returns:
+        str: e.g. "2516...:8c1f..." (19 zero-padded digits, a colon, the id)
+    """
+    ticks = _UNIX_EPOCH_TICKS + now_ns // 100
+    return f"{_MAX_TICKS - ticks:019d}:{unique_id}"
+
+# =============================================================================
+# TIMESTAMPS
+# =============================================================================
+def format_timestamp(now_ns):
+    """
+    Formats a time.time_ns() value as an ISO 8601 UTC string.
+
+    This is cheaper than datetime.utcnow().isoformat() (which is also
+    deprecated since Python 3.12), because no datetime object is created.
+
+    Returns:
+        str: e.g. "2024-01-31T14:05:09.123456"
+    """
+    # divmod splits the nanoseconds into whole seconds and the remainder
+    secs, ns = divmod(now_ns, 1_000_000_000)
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(secs))}.{ns // 1000:06d}"
+
+# =============================================================================
+# ANALYSIS COLUMNS
+# =============================================================================
+# Each analysis result is stored as its own typed column in Table Storage
+# (instead of one big JSON string), so reading history needs no JSON parsing.
+# Each pair is: (key in the API response, column name in Table Storage)
+ANALYSIS_COLUMNS = (
+    ("wordCount", "WordCount"),
+    ("characterCount", "CharacterCount"),
+    ("characterCountNoSpaces", "CharacterCountNoSpaces"),
+    ("sentenceCount", "SentenceCount"),
+    ("paragraphCount", "ParagraphCount"),
+    ("averageWordLength", "AverageWordLength"),
+    ("longestWord", "LongestWord"),
+    ("readingTimeMinutes", "ReadingTimeMinutes"),
+)
+
+# =============================================================================
+# SIZE LIMITS
+# =============================================================================
+def int_setting(name, default):
+    """
+    Reads a whole-number app setting, falling back to the default.
+
+    A missing, non-numeric or non-positive value logs a warning and uses the
+    default, so a typo in the app settings can't stop the functions loading.
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number <= 0:
+        logging.warning(f"Invalid {name} setting {value!r}, using {default}")
+        return default
+    return number
+
+# Texts longer than this (in characters) are rejected before any work is done
+# with "413 Payload Too Large". It can be changed with an app setting.
+MAX_TEXT_LENGTH = int_setting("MAX_TEXT_LENGTH", 100000)
+
+# TextAnalyzerBatch rejects arrays with more texts than this (also with 413).
+# Analysis runs on the same event loop as every other request, so one huge
+# batch would hold up everyone else. It can be changed with an app setting.
+MAX_BATCH_TEXTS = int_setting("MAX_BATCH_TEXTS", 100)
+
+# Table Storage allows at most 64 KiB per property (strings are stored as
+# UTF-16, 2 bytes per character) and 1 MiB per row, so we only store a
+# shortened copy of the text. The SHA-256 hash of the full text is stored
+# alongside it so the complete text can still be identified.
+MAX_STORED_TEXT_BYTES = 32 * 1024
+MAX_STORED_WORD_BYTES = 1024
+
+def truncate_for_storage(text, max_bytes):
+    """
+    Shortens a string so it takes at most max_bytes in Table Storage.
+
+    Parameters:
+        text: The string to shorten
+        max_bytes: The size limit in UTF-16 bytes
+
+    Returns:
+        str: The text itself if it fits, otherwise its longest prefix that fits
+    """
+    # Fast path for plain ASCII text (the most common case): every character
+    # is exactly 2 bytes in UTF-16, so we can just slice without encoding.
+    # isascii() is instant - Python already knows if a string is pure ASCII.
+    if text.isascii():
+        return text[:max_bytes // 2]
+
+    # Slow path: other characters (like emoji) can take 4 bytes, so encode,
+    # cut at the byte limit, and decode back
+    encoded = text.encode("utf-16-le")
+    if len(encoded) <= max_bytes:
+        return text
+    # errors="ignore" drops half of a character that got cut in two
+    return encoded[:max_bytes].decode("utf-16-le", errors="ignore")
+
+# =============================================================================
+# ERROR RESPONSES
+# =============================================================================
+# These error messages never change, so we convert them to JSON once when the
+# app starts instead of on every bad request
+
+# Returned when no text was provided - with helpful instructions
+_BAD_REQUEST_BODY = orjson.dumps({
+    "error": "No text provided",
+    "howToUse": {
+        "option1": "Add ?text=YourText to the URL",
+        "option2": "Send a POST request with JSON body: {\"text\": \"Your text here\"}",
+        "example": "https://your-function-url/api/TextAnalyzer?text=Hello world"
+    }
+})
+
+# Returned when the batch body isn't a list of texts
+_BAD_BATCH_REQUEST_BODY = orjson.dumps({
+    "error": "Body must be a non-empty JSON array of non-empty strings",
+    "example": ["Hello world", "Another text to analyze."]
+})
+
+# Returned when a text is longer than MAX_TEXT_LENGTH
+_TEXT_TOO_LONG_BODY = orjson.dumps({
+    "error": "Text too long",
+    "maxLength": MAX_TEXT_LENGTH
+})
+
+# Returned when a batch has more than MAX_BATCH_TEXTS texts
+_TOO_MANY_TEXTS_BODY = orjson.dumps({
+    "error": "Too many texts",
+    "maxTexts": MAX_BATCH_TEXTS
+})
+
+# Returned when there is no Table Storage connection string
+_DB_NOT_CONFIGURED_BODY = orjson.dumps({"error": "Database not configured"})
+
+# =============================================================================
+# ANALYSIS CACHE
+# =============================================================================
+# If the same text is analyzed again, we reuse the earlier result instead of
+# counting everything again. The cache is keyed by the SHA-256 hash of the
+# text (which we compute anyway for OriginalTextHash).
+# It's an "LRU" (Least Recently Used) cache: when it's full, the entry that
+# was used longest ago is thrown away.
+# Each cached result holds the longest word, which for a text without spaces
+# is the whole text - so only short texts are cached. That keeps the cache to
+# a few MB at most (1024 entries x 2048 characters), whatever callers send.
+ANALYSIS_CACHE_SIZE = 1024
+MAX_CACHED_TEXT_LENGTH = 2048
+_analysis_cache = OrderedDict()
+
+def cached_analyze_text(text, text_hash):
+    """
+    Same as analyze_text(), but reuses the result for texts seen recently.
+
+    Parameters:
+        text: The text to analyze (a non-empty string)
+        text_hash: The SHA-256 hex digest of the text
+
+    Returns:
+        dict: The analysis results (shared between calls - don't modify it)
+    """
+    # Long texts are never cached (see above)
+    if len(text) > MAX_CACHED_TEXT_LENGTH:
+        return analyze_text(text)
+
+    analysis = _analysis_cache.get(text_hash)
+    if analysis is not None:
+        # Mark it as recently used
+        _analysis_cache.move_to_end(text_hash)
+        return analysis
+
+    analysis = analyze_text(text)
+    _analysis_cache[text_hash] = analysis
+    if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+        # Remove the least recently used entry
+        _analysis_cache.popitem(last=False)
+    return analysis
+
+# =============================================================================
+# RECORD BUILDER
+# =============================================================================
+# Used by both TextAnalyzer and TextAnalyzerBatch so a single text and a
+# batch of texts are stored and returned in exactly the same shape.
+def build_records(text):
+    """
+    Analyzes a text and builds the Table Storage entity and API response for it.
+
+    Parameters:
+        text: The text to analyze (a non-empty string)
+
+    Returns:
+        tuple: (entity, response_data)
+    """
+    # The SHA-256 hash identifies the full text (it's stored, and it's the cache key)
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    # All the counting happens in one helper (see analyze_text above),
+    # unless this exact text was analyzed recently (see ANALYSIS CACHE above)
+    # The dictionary it returns is built once and reused below
+    analysis = cached_analyze_text(text, text_hash)
+
+    # Current timestamp (read the clock once and use it for both values below)
+    now_ns = time.time_ns()
+    timestamp = format_timestamp(now_ns)
+    # The RowKey starts with a reversed timestamp so the newest rows come first
+    # token_hex(16) gives 32 random hex characters - as unique as a UUID, but cheaper to make
+    row_key = make_row_key(now_ns, secrets.token_hex(16))
+
+    # For Table Storage, we flatten the structure because it doesn't support nested JSON as well as Cosmos
+    # Every analysis value gets its own typed column (see ANALYSIS_COLUMNS above)
+    
+    # Data entity for Table Storage
+    # Must have PartitionKey and RowKey
+    entity = {
+        "PartitionKey": PARTITION_KEY,
+        "RowKey": row_key,
+        # Only a shortened copy of the text is stored (see SIZE LIMITS above)
+        "OriginalText": truncate_for_storage(text, MAX_STORED_TEXT_BYTES),
+        "OriginalTextHash": text_hash,
+        "AnalyzedAt": timestamp,
+    }
+    for key, column in ANALYSIS_COLUMNS:
+        entity[column] = analysis[key]
+    # A text with no spaces at all is one huge "word", so shorten it too
+    entity["LongestWord"] = truncate_for_storage(analysis["longestWord"], MAX_STORED_WORD_BYTES)
+
+    # Response structure (same as before for the API user)
+    response_data = {
+        "id": row_key,
+        "originalText": text,
+        # Same dictionary object as above - no need to rebuild it
+        "analysis": analysis,
+        "metadata": {
+            "analyzedAt": timestamp,
+            "textPreview": text[:100] + "..." if analysis["characterCount"] > 100 else text
+        }
+    }
+
+    return entity, response_data
+
 # =============================================================================
 # DEFINE THE TEXT ANALYZER FUNCTION
 # =============================================================================
 # The @app.route decorator tells Azure: "When someone visits /api/TextAnalyzer, run this function"
 # This is called a "decorator" - it adds extra behavior to our function
 @app.route(route="TextAnalyzer")
-def TextAnalyzer(req: func.HttpRequest) -> func.HttpResponse:
+async def TextAnalyzer(req: func.HttpRequest) -> func.HttpResponse:
     """
     This function analyzes text and returns statistics about it.
 
@@ -71,183 +512,170 @@ def TextAnalyzer(req: func.HttpRequest) -> func.HttpResponse:
     text = req.params.get('text')
 
     # If text wasn't in the URL, try to get it from the request body (JSON)
-    if not text:
+    # We only try to parse a body that exists and isn't some other format
+    # (like a form) - a plain GET has no body, so it skips this completely
+    # instead of failing to parse and raising an error every time
+    body = req.get_body() if not text else b""
+    content_type = req.headers.get('content-type') or ''
+    if body and (not content_type or 'json' in content_type):
         try:
-            # Try to parse the request body as JSON
+            # Parse the raw body bytes directly with orjson
+            # (much faster than req.get_json(), which uses the built-in json)
             # Example body: {"text": "Hello world"}
-            req_body = req.get_json()
-            text = req_body.get('text')
+            req_body = orjson.loads(body)
+            # Only accept a JSON object with a string "text" field
+            if isinstance(req_body, dict) and isinstance(req_body.get('text'), str):
+                text = req_body['text']
         except ValueError:
             # If the body isn't valid JSON, just continue (text stays None)
+            # (orjson.JSONDecodeError is a kind of ValueError)
             pass
 
     # =========================================================================
     # STEP 2: ANALYZE THE TEXT (if text was provided)
     # =========================================================================
     if text:
-        # ----- Word Analysis -----
-        # split() breaks the text into a list of words
-        # "Hello world" becomes ["Hello", "world"]
-        words = text.split()
-
-        # len() counts items in a list
-        # ["Hello", "world"] has length 2
-        word_count = len(words)
-
-        # ----- Character Analysis -----
-        # len() on a string counts characters (including spaces)
-        # "Hello world" has 11 characters
-        char_count = len(text)
-
-        # replace(" ", "") removes all spaces, then we count
-        # "Hello world" becomes "Helloworld" (10 characters)
-        char_count_no_spaces = len(text.replace(" ", ""))
-
-        # ----- Sentence Analysis -----
-        # re.findall() finds all matches of a pattern
-        # r'[.!?]+' means: find any sequence of periods, exclamation marks, or question marks
-        # "Hello! How are you?" returns ['!', '?'] (2 sentences)
-        # The "or 1" means: if no punctuation found, assume at least 1 sentence
-        sentence_count = len(re.findall(r'[.!?]+', text)) or 1
-
-        # ----- Paragraph Analysis -----
-        # Paragraphs are separated by blank lines (two newlines: \n\n)
-        # split('\n\n') breaks text at blank lines
-        # We filter out empty paragraphs with "if p.strip()"
-        # strip() removes whitespace - empty strings become "" which is False
-        paragraph_count = len([p for p in text.split('\n\n') if p.strip()])
-
-        # ----- Reading Time Calculation -----
-        # Average reading speed is about 200 words per minute
-        # round(x, 1) rounds to 1 decimal place
-        # 100 words / 200 wpm = 0.5 minutes
-        reading_time_minutes = round(word_count / 200, 1)
-
-        # ----- Average Word Length -----
-        # Total characters (no spaces) divided by number of words
-        # We check "if word_count > 0" to avoid dividing by zero
-        avg_word_length = round(char_count_no_spaces / word_count, 1) if word_count > 0 else 0
-
-        # ----- Find Longest Word -----
-        # max() finds the largest item
-        # key=len means "compare words by their length"
-        # max(["Hi", "Hello", "Hey"], key=len) returns "Hello"
-        longest_word = max(words, key=len) if words else ""
+        # Refuse very long texts before doing any work
+        # status_code=413 means "Payload Too Large"
+        if len(text) > MAX_TEXT_LENGTH:
+            return json_bytes_response(_TEXT_TOO_LONG_BODY, 413)
+
+        # Analyze the text and build both the database entity and the
+        # response (see build_records above)
+        entity, response_data = build_records(text)
 
         # =====================================================================
-        # STEP 3: BUILD THE RESPONSE
+        # STEP 3: SAVE AND RETURN THE RESULTS
         # =====================================================================
-        # Create a Python dictionary with all our analysis results
-        # This will be converted to JSON format
-        
-        # Current timestamp
-        timestamp = datetime.utcnow().isoformat()
-        unique_id = str(uuid.uuid4())
-
-        # For Table Storage, we flatten the structure a bit because it doesn't support nested JSON as well as Cosmos
-        # However, we can store the complex analysis as a JSON string if we want, or individual columns.
-        # For simplicity and queryability, we'll store key metrics as columns and the full result as a JSON string if needed.
-        
-        # Data entity for Table Storage
-        # Must have PartitionKey and RowKey
-        entity = {
-            "PartitionKey": "Analysis",
-            "RowKey": unique_id,
-            "OriginalText": text,
-            "WordCount": word_count,
-            "AnalyzedAt": timestamp,
-            # We can store the full analysis JSON as a string to preserve structure
-            "FullAnalysisJson": json.dumps({
-                "wordCount": word_count,
-            "characterCount": char_count,
-            "characterCountNoSpaces": char_count_no_spaces,
-            "sentenceCount": sentence_count,
-            "paragraphCount": paragraph_count,
-            "averageWordLength": avg_word_length,
-            "longestWord": longest_word,
-            "readingTimeMinutes": reading_time_minutes
-            })
-        }
-
-        # Response structure (same as before for the API user)
-        response_data = {
-            "id": unique_id,
-            "originalText": text,
-            "analysis": {
-                "wordCount": word_count,
-                "characterCount": char_count,
-                "characterCountNoSpaces": char_count_no_spaces,
-                "sentenceCount": sentence_count,
-                "paragraphCount": paragraph_count,
-                "averageWordLength": avg_word_length,
-                "longestWord": longest_word,
-                "readingTimeMinutes": reading_time_minutes
-            },
-            "metadata": {
-                "analyzedAt": timestamp,
-                "textPreview": text[:100] + "..." if len(text) > 100 else text
-            }
-        }
-
-        # Save to Table Storage (if configured)
-        try:
-            tc = get_table_client()
-            if tc:
-                tc.create_entity(entity=entity)
-        except Exception as e:
-            logging.error(f"Failed to save to Table Storage: {e}")
+        # Save to Table Storage (if configured) in the background
+        # (see save_in_background above - we don't wait for it to finish)
+        tc = await get_table_client()
+        if tc:
+            save_in_background(tc.create_entity(entity=entity), "analysis")
 
         # Return a successful HTTP response
-        # json.dumps() converts Python dictionary to JSON string
-        # indent=2 makes the JSON nicely formatted (2 spaces per indent level)
-        # mimetype tells the browser "this is JSON data"
-        # status_code=200 means "OK - Success"
-        return func.HttpResponse(
-            json.dumps(response_data, indent=2),
-            mimetype="application/json",
-            status_code=200
-        )
+        # json_response() converts the Python dictionary to JSON bytes with orjson
+        # and marks it as "application/json" (see json_response above)
+        # json_options() adds indentation only when ?pretty=1 is used
+        # The default status_code=200 means "OK - Success"
+        return json_response(response_data, option=json_options(req))
 
     # =========================================================================
     # STEP 4: HANDLE MISSING TEXT (Error Response)
     # =========================================================================
     else:
         # If no text was provided, return helpful instructions
-        instructions = {
-            "error": "No text provided",
-            "howToUse": {
-                "option1": "Add ?text=YourText to the URL",
-                "option2": "Send a POST request with JSON body: {\"text\": \"Your text here\"}",
-                "example": "https://your-function-url/api/TextAnalyzer?text=Hello world"
-            }
-        }
-
-        # Return an error response
+        # (already converted to JSON - see ERROR RESPONSES above)
         # status_code=400 means "Bad Request - client made an error"
-        return func.HttpResponse(
-            json.dumps(instructions, indent=2),
-            mimetype="application/json",
-            status_code=400
-        )
+        return json_bytes_response(_BAD_REQUEST_BODY, 400)
+
+# =============================================================================
+# DEFINE THE BATCH TEXT ANALYZER FUNCTION
+# =============================================================================
+# Azure Table Storage can save up to 100 entities (with the same PartitionKey)
+# in a single "transaction" - one HTTP request instead of 100
+MAX_BATCH_SIZE = 100
+
+# A transaction is also limited to 4 MiB in total. The Azure SDK sends each
+# entity as JSON with every non-ASCII character escaped as \uXXXX (6 bytes),
+# so a batch of long non-English texts can be much bigger than it looks.
+# We stay well below the limit and allow extra room per entity for the
+# request headers the SDK adds around it.
+MAX_TRANSACTION_BYTES = 3 * 1024 * 1024
+TRANSACTION_BYTES_PER_ENTITY = 1024
+
+def transaction_chunks(entities):
+    """
+    Splits entities into groups that each fit in one Table Storage transaction.
+
+    Each group has at most MAX_BATCH_SIZE entities and roughly at most
+    MAX_TRANSACTION_BYTES of serialized data.
+
+    Parameters:
+        entities: The entities to save (all with the same PartitionKey)
+
+    Returns:
+        list: A list of lists of entities
+    """
+    chunks = []
+    chunk = []
+    chunk_bytes = 0
+    for entity in entities:
+        # json.dumps escapes non-ASCII the same way the SDK does
+        size = len(json.dumps(entity)) + TRANSACTION_BYTES_PER_ENTITY
+        if chunk and (len(chunk) == MAX_BATCH_SIZE or chunk_bytes + size > MAX_TRANSACTION_BYTES):
+            chunks.append(chunk)
+            chunk = []
+            chunk_bytes = 0
+        chunk.append(entity)
+        chunk_bytes += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+@app.route(route="TextAnalyzerBatch", methods=["POST"])
+async def TextAnalyzerBatch(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Analyzes many texts in one call and saves them with batch transactions.
+
+    Parameters:
+        req: The incoming HTTP request (body is a JSON array of strings)
+             Example body: ["Hello world", "Another text to analyze."]
+
+    Returns:
+        func.HttpResponse: JSON response with one analysis result per text
+    """
+    logging.info('Text Analyzer Batch API was called!')
+
+    # Parse the body - it must be a non-empty JSON array of strings
+    try:
+        texts = orjson.loads(req.get_body())
+    except ValueError:
+        texts = None
+
+    if not isinstance(texts, list) or not texts or not all(isinstance(t, str) and t for t in texts):
+        return json_bytes_response(_BAD_BATCH_REQUEST_BODY, 400)
+
+    # Refuse batches with too many texts, before doing any work
+    if len(texts) > MAX_BATCH_TEXTS:
+        return json_bytes_response(_TOO_MANY_TEXTS_BODY, 413)
+
+    # Refuse the whole batch if any text is too long, before doing any work
+    if any(len(t) > MAX_TEXT_LENGTH for t in texts):
+        return json_bytes_response(_TEXT_TOO_LONG_BODY, 413)
+
+    # Analyze every text (same shape as the single TextAnalyzer)
+    records = [build_records(text) for text in texts]
+
+    # Save to Table Storage in chunks that fit in one transaction each
+    # (see transaction_chunks above - limited by count and by size)
+    # Every entity uses the same PartitionKey, so each chunk is one transaction
+    # Like TextAnalyzer, the saves run in the background
+    tc = await get_table_client()
+    if tc:
+        for chunk in transaction_chunks([entity for entity, _ in records]):
+            save_in_background(
+                tc.submit_transaction([("create", entity) for entity in chunk]),
+                "batch"
+            )
+
+    results = [response_data for _, response_data in records]
+    return json_response({"count": len(results), "results": results}, option=json_options(req))
 
 # =============================================================================
 # DEFINE THE HISTORY ENDPOINT
 # =============================================================================
 @app.route(route="GetAnalysisHistory", auth_level=func.AuthLevel.ANONYMOUS)
-def GetAnalysisHistory(req: func.HttpRequest) -> func.HttpResponse:
+async def GetAnalysisHistory(req: func.HttpRequest) -> func.HttpResponse:
     """
     Retrieves past analysis results from Table Storage.
     """
     logging.info('GetAnalysisHistory processed a request.')
 
     try:
-        tc = get_table_client()
+        tc = await get_table_client()
         if not tc:
-             return func.HttpResponse(
-                json.dumps({"error": "Database not configured"}, indent=2),
-                mimetype="application/json",
-                status_code=500
-            )
+            return json_bytes_response(_DB_NOT_CONFIGURED_BODY, 500)
         
         # Get 'limit' from query parameter, default to 10
         limit = req.params.get('limit', '10')
@@ -255,45 +683,58 @@ def GetAnalysisHistory(req: func.HttpRequest) -> func.HttpResponse:
             limit = int(limit)
         except ValueError:
             limit = 10
+        # Table Storage returns at most 1000 rows per page, and we need at least 1
+        limit = max(1, min(limit, 1000))
+
+        # ?light=1 returns only the headline numbers (no original text and
+        # no full analysis), which keeps each row down to a few hundred bytes
+        light = req.params.get('light') == '1'
+
+        # Only ask the database for the columns we actually use
+        # (OriginalText can be large, so skip it when we don't need it)
+        if light:
+            columns = ["RowKey", "AnalyzedAt", "WordCount"]
+        else:
+            columns = ["RowKey", "OriginalText", "AnalyzedAt"]
+            columns += [column for _, column in ANALYSIS_COLUMNS]
 
         # Query Table Storage
-        # We query by PartitionKey and sort locally because Table Storage doesn't support server-side sorting easily
-        # For a lab, fetching top N and sorting in Python is fine
-        entities = list(tc.query_entities(query_filter="PartitionKey eq 'Analysis'"))
-        
-        # Sort by AnalyzedAt descending
-        entities.sort(key=lambda x: x.get('AnalyzedAt', ''), reverse=True)
-        
-        # Take the top 'limit'
-        recent_items = entities[:limit]
+        # Rows come back already sorted newest-first (see make_row_key above),
+        # so we ask for one page of 'limit' rows and stop reading after that -
+        # no need to download the whole table and sort it in Python
+        pager = tc.query_entities(
+            query_filter=f"PartitionKey eq '{PARTITION_KEY}'",
+            select=columns,
+            results_per_page=limit
+        )
         
-        # Clean up for response (remove system properties, parse JSON)
+        # Clean up for response (remove system properties)
+        # The analysis is rebuilt straight from the typed columns - no JSON parsing
         results = []
-        for item in recent_items:
-            try:
-                 # Try to parse the stored JSON for the full details
-                analysis_details = json.loads(item.get("FullAnalysisJson", "{}"))
-            except:
-                analysis_details = {}
-
-            results.append({
-                "id": item.get("RowKey"),
-                "originalText": item.get("OriginalText"),
-                "analyzedAt": item.get("AnalyzedAt"),
-                "analysis": analysis_details
-            })
-
-        return func.HttpResponse(
-            json.dumps({"count": len(results), "results": results}, indent=2),
-            mimetype="application/json",
-            status_code=200
-        )
+        async for item in pager:
+            if light:
+                results.append({
+                    "id": item.get("RowKey"),
+                    "analyzedAt": item.get("AnalyzedAt"),
+                    "analysis": {"wordCount": item.get("WordCount")}
+                })
+            else:
+                analysis_details = {key: item.get(column) for key, column in ANALYSIS_COLUMNS}
+
+                results.append({
+                    "id": item.get("RowKey"),
+                    "originalText": item.get("OriginalText"),
+                    "analyzedAt": item.get("AnalyzedAt"),
+                    "analysis": analysis_details
+                })
+
+            # Stop as soon as we have enough rows (don't fetch the next page)
+            if len(results) >= limit:
+                break
+
+        return json_response({"count": len(results), "results": results}, option=json_options(req))
 
     except Exception as e:
         logging.error(f"Error retrieving history: {e}")
-        return func.HttpResponse(
-            json.dumps({"error": str(e)}, indent=2),
-            mimetype="application/json",
-            status_code=500
-        )
+        return json_response({"error": str(e)}, 500)
 